@@ -5,6 +5,8 @@ import logging
 import os
 import shutil
 import signal
+from collections.abc import Callable
+from functools import cache
 from importlib.metadata import version
 from pathlib import Path
 from typing import Annotated
@@ -42,20 +44,41 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _resolve(binary: str) -> str | None:
+    """Return the path of binary on $PATH, caching the result for later checks."""
+    return shutil.which(binary)
+
+
 def check_dependencies(services: set[str], camera_type: str | None) -> tuple[bool, list[str]]:
     """Check for required external dependencies based on enabled services."""
     missing = []
 
     # Camera service dependencies
     if "camera" in services and camera_type == "rtsp":
-        if not shutil.which("ffmpeg"):
+        if not _resolve("ffmpeg"):
             missing.append("ffmpeg")
-        if not shutil.which("mediamtx"):
+        if not _resolve("mediamtx"):
             missing.append("mediamtx")
 
+    if missing:
+        # Forget the misses so a binary installed later is found on a recheck
+        _resolve.cache_clear()
+
     return len(missing) == 0, missing
 
 
+def get_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Return the uvloop event loop factory if uvloop is installed, None otherwise."""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+
+    logger.debug("Using uvloop event loop")
+    return uvloop.new_event_loop
+
+
 def parse_services(services_str: str | None, enable_all: bool) -> set[str]:
     """Parse services string into a set of service names."""
     all_services = {"camera", "mqtt", "ftp"}
@@ -121,9 +144,15 @@ async def run_proxy(
         stop_event.set()
 
     loop = asyncio.get_running_loop()
-    for sig in (signal.SIGINT, signal.SIGTERM):
-        # noinspection PyTypeChecker
-        loop.add_signal_handler(sig, signal_handler)
+    sigs = (signal.SIGINT, signal.SIGTERM)
+    if hasattr(signal, "SIGHUP"):
+        sigs += (signal.SIGHUP,)
+    for sig in sigs:
+        try:
+            loop.add_signal_handler(sig, signal_handler)
+        except NotImplementedError:
+            # Windows event loops do not support add_signal_handler
+            signal.signal(sig, lambda _s, _f: loop.call_soon_threadsafe(signal_handler))
 
     try:
         # Generate shared TLS certificate
@@ -368,6 +397,8 @@ def main(
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1) from None
 
+    loop_factory = get_loop_factory()
+
     typer.echo(f"Connecting to printer at {printer_ip}...")
     typer.echo(f"Enabled services: {', '.join(sorted(enabled_services))}")
 
@@ -375,7 +406,9 @@ def main(
     camera_type: str | None = None
     if "camera" in enabled_services:
         try:
-            camera_type = asyncio.run(detect_camera_type(printer_ip, access_code))
+            camera_type = asyncio.run(
+                detect_camera_type(printer_ip, access_code), loop_factory=loop_factory
+            )
             typer.echo(f"Detected camera type: {camera_type.upper()}")
         except RuntimeError as e:
             typer.echo(f"Warning: Could not detect camera type: {e}", err=True)
@@ -413,7 +446,8 @@ def main(
             bind=bind,
             services=enabled_services,
             camera_type=camera_type,
-        )
+        ),
+        loop_factory=loop_factory,
     )
 
 
@@ -13,11 +13,14 @@ on the same port. This allows clients that only support a single server IP
 to work with the printer through the proxy.
 """
 
+from __future__ import annotations
+
 import asyncio
-import contextlib
 import logging
+import socket
+from collections.abc import Callable
+from typing import cast
 
-from pandaproxy.helper import close_writer
 from pandaproxy.protocol import FTP_PORT
 
 logger = logging.getLogger(__name__)
@@ -27,6 +30,90 @@ logger = logging.getLogger(__name__)
 FTP_DATA_PORT_START = 2000
 FTP_DATA_PORT_END = 2100
 
+# Write buffer limits for passthrough transports. Reading from the peer is only
+# paused once this much data is queued, instead of at the 64 KiB default.
+WRITE_BUFFER_HIGH = 1 << 20
+WRITE_BUFFER_LOW = 1 << 18
+
+# Seconds a closing transport may spend flushing its buffer before it is aborted
+CLOSE_TIMEOUT = 2.0
+
+# Seconds stop() waits for connections to close before aborting them
+SHUTDOWN_TIMEOUT = 5.0
+
+
+class _PassthroughProtocol(asyncio.Protocol):
+    """One side of a TCP passthrough connection.
+
+    Bytes received on this transport are written straight to the peer's
+    transport, without going through the Streams layer. Back-pressure is wired
+    across the pair: when the peer's write buffer fills up, reading on this side
+    is paused until it drains.
+    """
+
+    def __init__(self, on_connect: Callable[[_PassthroughProtocol], object] | None = None) -> None:
+        self.transport: asyncio.Transport | None = None
+        self.peer: _PassthroughProtocol | None = None
+        self.closed: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._on_connect = on_connect
+        self._abort_handle: asyncio.TimerHandle | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        transport = cast(asyncio.Transport, transport)
+        self.transport = transport
+        # Leave incoming bytes in the kernel until the peer is attached
+        transport.pause_reading()
+        if self._on_connect:
+            self._on_connect(self)
+
+    def close(self) -> None:
+        """Close the transport, aborting it if it has not closed within CLOSE_TIMEOUT.
+
+        A graceful close waits for the write buffer to drain, which never happens
+        when the other end has stopped reading.
+        """
+        if not self.transport or self._abort_handle:
+            return
+        self.transport.close()
+        self._abort_handle = asyncio.get_running_loop().call_later(
+            CLOSE_TIMEOUT, self.transport.abort
+        )
+
+    def attach(self, peer: _PassthroughProtocol) -> None:
+        """Start forwarding received bytes to peer."""
+        self.peer = peer
+        if self.transport:
+            self.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH, low=WRITE_BUFFER_LOW)
+            self.transport.resume_reading()
+
+    def data_received(self, data: bytes) -> None:
+        if self.peer and self.peer.transport:
+            self.peer.transport.write(data)
+
+    def eof_received(self) -> bool | None:
+        # Either side finishing ends the session, with the same bounded close
+        self.close()
+        return None
+
+    def pause_writing(self) -> None:
+        # Our write buffer is full, stop reading from the peer until it drains
+        if self.peer and self.peer.transport:
+            self.peer.transport.pause_reading()
+
+    def resume_writing(self) -> None:
+        if self.peer and self.peer.transport:
+            self.peer.transport.resume_reading()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if exc:
+            logger.debug("FTP passthrough connection lost: %s", exc)
+        if self._abort_handle:
+            self._abort_handle.cancel()
+        if self.peer:
+            self.peer.close()
+        if not self.closed.done():
+            self.closed.set_result(None)
+
 
 class FTPProxy:
     """TCP passthrough proxy for FTPS connections.
@@ -47,7 +134,10 @@ class FTPProxy:
         self._control_server: asyncio.Server | None = None
         self._data_servers: list[asyncio.Server] = []
         self._running = False
-        self._active_connections: set[asyncio.Task] = set()
+        # Connection tasks are named with this prefix so stop() can find its own
+        self._task_prefix = f"ftp-proxy-{id(self)}-"
+        # Strong references, the event loop only keeps weak ones to running tasks
+        self._tasks: set[asyncio.Task[None]] = set()
 
     async def start(self) -> None:
         """Start the FTP proxy servers."""
@@ -57,25 +147,32 @@ class FTPProxy:
         logger.info("Starting FTP passthrough proxy on %s:%d", self.bind_address, self.port)
         self._running = True
 
+        loop = asyncio.get_running_loop()
+
         # Start control channel server (port 990)
-        self._control_server = await asyncio.start_server(
-            lambda r, w: self._handle_connection(r, w, self.port),
+        self._control_server = await loop.create_server(
+            self._client_protocol,
             self.bind_address,
             self.port,
         )
 
         # Start data channel servers (port range for PASV mode)
-        for data_port in range(FTP_DATA_PORT_START, FTP_DATA_PORT_END + 1):
-            try:
-                server = await asyncio.start_server(
-                    lambda r, w, p=data_port: self._handle_connection(r, w, p),
-                    self.bind_address,
-                    data_port,
-                )
-                self._data_servers.append(server)
-            except OSError as e:
-                # Port might already be in use, skip it
-                logger.debug("Could not bind to port %d: %s", data_port, e)
+        infos = await loop.getaddrinfo(
+            self.bind_address, None, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE
+        )
+        sockets = self._bind_data_sockets(infos)
+        if not sockets:
+            logger.warning(
+                "Could not bind any FTP data port in %d-%d on %s",
+                FTP_DATA_PORT_START,
+                FTP_DATA_PORT_END,
+                self.bind_address,
+            )
+        self._data_servers = list(
+            await asyncio.gather(
+                *(loop.create_server(self._client_protocol, sock=sock) for sock in sockets)
+            )
+        )
 
         logger.info(
             "FTP proxy listening on port %d and data ports %d-%d",
@@ -84,61 +181,114 @@ class FTPProxy:
             FTP_DATA_PORT_END,
         )
 
+    def _bind_data_sockets(
+        self, infos: list[tuple[int, int, int, str, tuple]]
+    ) -> list[socket.socket]:
+        """Bind listening sockets for the data port range in a single synchronous pass.
+
+        infos is the resolved bind address (as from getaddrinfo), so each port is
+        bound on the same addresses as the control server. Binding the raw sockets
+        up front avoids a resolver lookup and an event loop round-trip per port.
+        Ports that are already in use are skipped.
+        """
+        # getaddrinfo may list the same address once per protocol
+        addresses = list(dict.fromkeys((family, sockaddr) for family, _, _, _, sockaddr in infos))
+        sockets: list[socket.socket] = []
+        for data_port in range(FTP_DATA_PORT_START, FTP_DATA_PORT_END + 1):
+            for family, sockaddr in addresses:
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                    if family == socket.AF_INET6:
+                        # Match loop.create_server(), which keeps IPv6 sockets IPv6-only
+                        sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+                    sock.setblocking(False)
+                    sock.bind((sockaddr[0], data_port, *sockaddr[2:]))
+                    sock.listen(128)
+                except OSError as e:
+                    # Port might already be in use, skip it
+                    sock.close()
+                    logger.debug("Could not bind to %s port %d: %s", sockaddr[0], data_port, e)
+                    continue
+                sockets.append(sock)
+        return sockets
+
     async def stop(self) -> None:
         """Stop the FTP proxy servers."""
         logger.info("Stopping FTP proxy")
         self._running = False
 
+        # Stop accepting first so no new connection escapes the cancellation below
+        servers = [server for server in (self._control_server, *self._data_servers) if server]
+        for server in servers:
+            server.close()
+        # Let connections accepted just before close() reach _client_connected
+        await asyncio.sleep(0)
+
         # Cancel all active connections
-        for task in list(self._active_connections):
+        tasks = [
+            task for task in asyncio.all_tasks() if task.get_name().startswith(self._task_prefix)
+        ]
+        for task in tasks:
             task.cancel()
-        if self._active_connections:
-            await asyncio.gather(*self._active_connections, return_exceptions=True)
-        self._active_connections.clear()
 
-        # Close servers
-        if self._control_server:
-            self._control_server.close()
-            await self._control_server.wait_closed()
+        # wait_closed() also waits for client transports to flush their buffers,
+        # so it is bounded together with the cancelled tasks
+        waiters = [*tasks, *(asyncio.ensure_future(server.wait_closed()) for server in servers)]
+        if waiters:
+            _, pending = await asyncio.wait(waiters, timeout=SHUTDOWN_TIMEOUT)
+            if pending:
+                logger.warning("FTP connections did not close in time, aborting them")
+                # uvloop servers lack abort_clients(), but their wait_closed() does
+                # not wait for client transports, and the transports abort
+                # themselves after CLOSE_TIMEOUT anyway
+                for server in servers:
+                    if hasattr(server, "abort_clients"):
+                        server.abort_clients()
+                _, pending = await asyncio.wait(pending, timeout=SHUTDOWN_TIMEOUT)
+            for waiter in pending:
+                waiter.cancel()
 
-        for server in self._data_servers:
-            server.close()
-        for server in self._data_servers:
-            await server.wait_closed()
         self._data_servers.clear()
 
         logger.info("FTP proxy stopped")
 
-    async def _handle_connection(
-        self,
-        client_reader: asyncio.StreamReader,
-        client_writer: asyncio.StreamWriter,
-        port: int,
-    ) -> None:
+    def _client_protocol(self) -> _PassthroughProtocol:
+        """Create the protocol for an accepted client connection."""
+        return _PassthroughProtocol(on_connect=self._client_connected)
+
+    def _client_connected(self, client: _PassthroughProtocol) -> None:
+        """Dispatch an accepted connection by the local port it arrived on."""
+        port = client.transport.get_extra_info("sockname")[1]
+        task = asyncio.create_task(
+            self._handle_connection(client, port), name=f"{self._task_prefix}{port}"
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        # A task cancelled before it starts never reaches its finally block
+        task.add_done_callback(lambda _: client.close())
+
+    async def _handle_connection(self, client: _PassthroughProtocol, port: int) -> None:
         """Handle a TCP connection by forwarding to the printer."""
-        peername = client_writer.get_extra_info("peername")
+        peername = client.transport.get_extra_info("peername")
         port_type = "control" if port == self.port else "data"
         logger.debug("FTP %s connection from %s on port %d", port_type, peername, port)
 
-        # Create task for this connection
-        task = asyncio.current_task()
-        if task:
-            self._active_connections.add(task)
-
-        upstream_writer: asyncio.StreamWriter | None = None
+        upstream: _PassthroughProtocol | None = None
 
         try:
             # Connect to printer on the same port
-            upstream_reader, upstream_writer = await asyncio.wait_for(
-                asyncio.open_connection(self.printer_ip, port),
+            loop = asyncio.get_running_loop()
+            _, upstream = await asyncio.wait_for(
+                loop.create_connection(_PassthroughProtocol, self.printer_ip, port),
                 timeout=10.0,
             )
             logger.debug("Connected to printer %s:%d", self.printer_ip, port)
 
-            # Forward data in both directions
-            await self._forward_bidirectional(
-                client_reader, client_writer, upstream_reader, upstream_writer
-            )
+            # Forward data in both directions until either side closes
+            client.attach(upstream)
+            upstream.attach(client)
+            await client.closed
 
         except TimeoutError:
             logger.warning("Connection to printer %s:%d timed out", self.printer_ip, port)
@@ -147,55 +297,7 @@ class FTPProxy:
         except Exception as e:
             logger.debug("FTP %s connection error: %s", port_type, e)
         finally:
-            await close_writer(client_writer)
-            if upstream_writer:
-                await close_writer(upstream_writer)
-            if task:
-                self._active_connections.discard(task)
+            client.close()
+            if upstream:
+                upstream.close()
             logger.debug("FTP %s connection closed", port_type)
-
-    async def _forward_bidirectional(
-        self,
-        client_reader: asyncio.StreamReader,
-        client_writer: asyncio.StreamWriter,
-        upstream_reader: asyncio.StreamReader,
-        upstream_writer: asyncio.StreamWriter,
-    ) -> None:
-        """Forward data bidirectionally between client and upstream."""
-
-        async def forward(
-            src: asyncio.StreamReader,
-            dst: asyncio.StreamWriter,
-            direction: str,
-        ) -> None:
-            """Forward data from src to dst."""
-            try:
-                while True:
-                    data = await src.read(65536)
-                    if not data:
-                        break
-                    dst.write(data)
-                    await dst.drain()
-            except asyncio.CancelledError:
-                raise
-            except Exception as e:
-                logger.debug("Forward %s error: %s", direction, e)
-
-        # Run both directions concurrently
-        task1 = asyncio.create_task(forward(client_reader, upstream_writer, "client->printer"))
-        task2 = asyncio.create_task(forward(upstream_reader, client_writer, "printer->client"))
-
-        try:
-            # Wait for either direction to complete
-            done, pending = await asyncio.wait([task1, task2], return_when=asyncio.FIRST_COMPLETED)
-
-            # Cancel the other direction
-            for task in pending:
-                task.cancel()
-                with contextlib.suppress(asyncio.CancelledError):
-                    await task
-
-        except asyncio.CancelledError:
-            task1.cancel()
-            task2.cancel()
-            raise
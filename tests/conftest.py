@@ -9,9 +9,9 @@ import pytest
 from pandaproxy.helper import generate_self_signed_cert
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def temp_certs():
-    """Generate temporary TLS certificates for testing."""
+    """Generate temporary TLS certificates once for the whole test session."""
     with tempfile.TemporaryDirectory() as tmpdir:
         cert_path = Path(tmpdir) / "test.crt"
         key_path = Path(tmpdir) / "test.key"
@@ -22,12 +22,13 @@ def temp_certs():
             san_ips=["127.0.0.1", "::1"],
             output_cert=cert_path,
             output_key=key_path,
+            key_type="ec",
         )
 
         yield cert_path, key_path
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def server_ssl_context(temp_certs):
     """Create server SSL context for mock servers."""
     cert_path, key_path = temp_certs
@@ -36,7 +37,7 @@ def server_ssl_context(temp_certs):
     return ctx
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client_ssl_context():
     """Create client SSL context that accepts self-signed certs."""
     ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
@@ -0,0 +1,50 @@
+"""Tests for CLI helpers."""
+
+import sys
+import types
+from unittest.mock import patch
+
+from pandaproxy.cli import _resolve, check_dependencies, get_loop_factory
+
+
+class TestCheckDependencies:
+    """Tests for check_dependencies function."""
+
+    def setup_method(self):
+        _resolve.cache_clear()
+
+    def teardown_method(self):
+        _resolve.cache_clear()
+
+    def test_lookups_are_cached(self):
+        """Should only search $PATH once per binary across checks."""
+        with patch("shutil.which", side_effect=lambda binary: f"/usr/bin/{binary}") as which:
+            assert check_dependencies({"camera"}, "rtsp") == (True, [])
+            assert check_dependencies({"camera"}, "rtsp") == (True, [])
+
+        assert sorted(call.args[0] for call in which.call_args_list) == ["ffmpeg", "mediamtx"]
+
+    def test_missing_binary_found_on_recheck(self):
+        """Should not cache a missing binary, so a later install is picked up."""
+        with patch("shutil.which", return_value=None):
+            assert check_dependencies({"camera"}, "rtsp") == (False, ["ffmpeg", "mediamtx"])
+
+        with patch("shutil.which", side_effect=lambda binary: f"/usr/bin/{binary}"):
+            assert check_dependencies({"camera"}, "rtsp") == (True, [])
+
+
+class TestGetLoopFactory:
+    """Tests for get_loop_factory function."""
+
+    def test_returns_none_without_uvloop(self):
+        """Should fall back to the default loop when uvloop is not installed."""
+        with patch.dict(sys.modules, {"uvloop": None}):
+            assert get_loop_factory() is None
+
+    def test_returns_uvloop_factory(self):
+        """Should return uvloop's new_event_loop when uvloop is installed."""
+        uvloop = types.ModuleType("uvloop")
+        uvloop.new_event_loop = lambda: None
+
+        with patch.dict(sys.modules, {"uvloop": uvloop}):
+            assert get_loop_factory() is uvloop.new_event_loop
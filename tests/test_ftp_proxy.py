@@ -6,10 +6,19 @@ sessions directly with the printer, enabling proper session reuse.
 """
 
 import asyncio
+import socket
+from unittest.mock import MagicMock
 
 import pytest
 
-from pandaproxy.ftp_proxy import FTP_DATA_PORT_END, FTP_DATA_PORT_START, FTPProxy
+from pandaproxy.ftp_proxy import (
+    FTP_DATA_PORT_END,
+    FTP_DATA_PORT_START,
+    WRITE_BUFFER_HIGH,
+    WRITE_BUFFER_LOW,
+    FTPProxy,
+    _PassthroughProtocol,
+)
 
 # Use ephemeral ports for testing (avoids privileged port issues)
 TEST_CONTROL_PORT = 19990
@@ -29,6 +38,50 @@ def test_proxy():
     return proxy
 
 
+async def _open_stuck_connection(proxy):
+    """Connect a client that never reads to a backend that floods it with data.
+
+    Returns the backend server, the client socket and the proxy's client-side
+    protocol once the proxy has data queued that it cannot flush.
+    """
+    chunk = b"x" * 65536
+
+    async def flood_handler(_reader, writer):
+        try:
+            while True:
+                writer.write(chunk)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    mock_server = await asyncio.start_server(flood_handler, "127.0.0.1", 0)
+    backend_port = mock_server.sockets[0].getsockname()[1]
+
+    clients = []
+    original_handle = proxy._handle_connection
+
+    async def patched_handle(client, _port):
+        clients.append(client)
+        await original_handle(client, backend_port)
+
+    proxy._handle_connection = patched_handle
+    await proxy.start()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", proxy.port))
+
+    async def buffered():
+        while not clients or not clients[0].transport.get_write_buffer_size():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(buffered(), timeout=5.0)
+    return mock_server, sock, clients[0]
+
+
 class TestFTPProxyLifecycle:
     """Test FTP proxy start/stop lifecycle."""
 
@@ -146,9 +199,9 @@ class TestFTPProxyPassthrough:
         # The proxy forwards to printer_ip:port, so we set printer port via a custom attribute
         original_handle = proxy._handle_connection
 
-        async def patched_handle(reader, writer, _port):
+        async def patched_handle(client, _port):
             # Always forward to the backend port
-            await original_handle(reader, writer, backend_port)
+            await original_handle(client, backend_port)
 
         proxy._handle_connection = patched_handle
 
@@ -175,6 +228,124 @@ class TestFTPProxyPassthrough:
             mock_server.close()
             await mock_server.wait_closed()
 
+    @pytest.mark.asyncio
+    async def test_passthrough_large_transfer(self, monkeypatch):
+        """Test that a transfer larger than the write buffers arrives intact."""
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_START", TEST_DATA_PORT_START)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_END", TEST_DATA_PORT_END)
+
+        payload = bytes(range(256)) * 16384  # 4 MiB
+
+        async def echo_handler(reader, writer):
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+
+        mock_server = await asyncio.start_server(echo_handler, "127.0.0.1", 0)
+        backend_port = mock_server.sockets[0].getsockname()[1]
+
+        proxy = FTPProxy(printer_ip="127.0.0.1", bind_address="127.0.0.1")
+        proxy.port = TEST_CONTROL_PORT
+        original_handle = proxy._handle_connection
+
+        async def patched_handle(client, _port):
+            await original_handle(client, backend_port)
+
+        proxy._handle_connection = patched_handle
+
+        await proxy.start()
+
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", TEST_CONTROL_PORT)
+
+            async def send():
+                writer.write(payload)
+                await writer.drain()
+
+            send_task = asyncio.create_task(send())
+            received = await asyncio.wait_for(reader.readexactly(len(payload)), timeout=10.0)
+            await send_task
+            assert received == payload
+
+            writer.close()
+            await writer.wait_closed()
+
+        finally:
+            await proxy.stop()
+            mock_server.close()
+            await mock_server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_active_connections(self, monkeypatch):
+        """Test that stop cancels forwarding tasks and closes client connections."""
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_START", TEST_DATA_PORT_START)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_END", TEST_DATA_PORT_END)
+
+        async def idle_handler(reader, writer):
+            await reader.read()
+            writer.close()
+
+        mock_server = await asyncio.start_server(idle_handler, "127.0.0.1", 0)
+        backend_port = mock_server.sockets[0].getsockname()[1]
+
+        proxy = FTPProxy(printer_ip="127.0.0.1", bind_address="127.0.0.1")
+        proxy.port = TEST_CONTROL_PORT
+        original_handle = proxy._handle_connection
+
+        async def patched_handle(client, _port):
+            await original_handle(client, backend_port)
+
+        proxy._handle_connection = patched_handle
+
+        await proxy.start()
+
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", TEST_CONTROL_PORT)
+            await asyncio.sleep(0.1)
+
+            names = [task.get_name() for task in asyncio.all_tasks()]
+            assert f"{proxy._task_prefix}{TEST_CONTROL_PORT}" in names
+            assert len(proxy._tasks) == 1
+
+            await proxy.stop()
+
+            data = await asyncio.wait_for(reader.read(100), timeout=2.0)
+            assert data == b""
+            names = [task.get_name() for task in asyncio.all_tasks()]
+            assert f"{proxy._task_prefix}{TEST_CONTROL_PORT}" not in names
+            assert not proxy._tasks
+
+            writer.close()
+            await writer.wait_closed()
+
+        finally:
+            await proxy.stop()
+            mock_server.close()
+            await mock_server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_stuck_client_aborted_after_close_timeout(self, monkeypatch):
+        """Test that a client which stops reading is aborted instead of kept open."""
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_START", TEST_DATA_PORT_START)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_END", TEST_DATA_PORT_END)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.CLOSE_TIMEOUT", 0.1)
+
+        proxy = FTPProxy(printer_ip="127.0.0.1", bind_address="127.0.0.1")
+        proxy.port = TEST_CONTROL_PORT
+        mock_server, sock, client = await _open_stuck_connection(proxy)
+
+        try:
+            client.close()
+            await asyncio.wait_for(client.closed, timeout=2.0)
+            assert client.transport.is_closing()
+        finally:
+            sock.close()
+            await proxy.stop()
+            mock_server.close()
+            await mock_server.wait_closed()
+
     @pytest.mark.asyncio
     async def test_proxy_handles_connection_refused(self, monkeypatch):
         """Test that proxy handles connection refused gracefully."""
@@ -250,6 +421,113 @@ class TestFTPProxyDataPorts:
         finally:
             await proxy.stop()
 
+    @pytest.mark.asyncio
+    async def test_data_port_in_use_is_skipped(self, test_proxy, monkeypatch):
+        """Test that a data port already bound elsewhere is skipped, not fatal."""
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_START", TEST_DATA_PORT_START)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_END", TEST_DATA_PORT_END)
+
+        blocker = await asyncio.start_server(lambda _r, _w: None, "127.0.0.1", TEST_DATA_PORT_START)
+        proxy = test_proxy
+
+        try:
+            await proxy.start()
+            data_ports = [s.sockets[0].getsockname()[1] for s in proxy._data_servers]
+            assert TEST_DATA_PORT_START not in data_ports
+            assert TEST_DATA_PORT_START + 1 in data_ports
+        finally:
+            await proxy.stop()
+            blocker.close()
+            await blocker.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_ipv6_data_sockets_are_v6only(self, monkeypatch):
+        """Test that IPv6 data sockets are IPv6-only, like the control server."""
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_START", TEST_DATA_PORT_START)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_END", TEST_DATA_PORT_START + 1)
+
+        if not socket.has_ipv6:
+            pytest.skip("IPv6 not available")
+
+        proxy = FTPProxy(printer_ip="::1", bind_address="::1")
+        infos = socket.getaddrinfo("::1", None, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE)
+        sockets = proxy._bind_data_sockets(infos)
+        if not sockets:
+            pytest.skip("IPv6 loopback not bindable")
+
+        try:
+            assert len(sockets) == 2
+            for sock in sockets:
+                assert sock.family == socket.AF_INET6
+                assert sock.getsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY) == 1
+        finally:
+            for sock in sockets:
+                sock.close()
+
+
+class TestPassthroughProtocol:
+    """Test the protocol pair that forwards bytes between transports."""
+
+    @staticmethod
+    def _make_pair():
+        client, upstream = _PassthroughProtocol(), _PassthroughProtocol()
+        client.connection_made(MagicMock(spec=asyncio.Transport))
+        upstream.connection_made(MagicMock(spec=asyncio.Transport))
+        client.attach(upstream)
+        upstream.attach(client)
+        return client, upstream
+
+    @pytest.mark.asyncio
+    async def test_reading_paused_until_attached(self):
+        """Test that no data is read before the peer is attached."""
+        protocol = _PassthroughProtocol()
+        transport = MagicMock(spec=asyncio.Transport)
+
+        protocol.connection_made(transport)
+
+        transport.pause_reading.assert_called_once()
+        transport.resume_reading.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_attach_sets_write_buffer_limits(self):
+        """Test that attaching raises the write buffer limits and resumes reading."""
+        client, _ = self._make_pair()
+
+        client.transport.set_write_buffer_limits.assert_called_once_with(
+            high=WRITE_BUFFER_HIGH, low=WRITE_BUFFER_LOW
+        )
+        client.transport.resume_reading.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_data_forwarded_to_peer(self):
+        """Test that received bytes are written to the peer transport."""
+        client, upstream = self._make_pair()
+
+        client.data_received(b"chunk")
+
+        upstream.transport.write.assert_called_once_with(b"chunk")
+
+    @pytest.mark.asyncio
+    async def test_back_pressure_pauses_peer(self):
+        """Test that a full write buffer pauses and resumes reading on the peer."""
+        client, upstream = self._make_pair()
+
+        upstream.pause_writing()
+        client.transport.pause_reading.assert_called()
+
+        upstream.resume_writing()
+        assert client.transport.resume_reading.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_connection_lost_closes_peer(self):
+        """Test that losing one side closes the other and resolves closed."""
+        client, upstream = self._make_pair()
+
+        client.connection_lost(None)
+
+        upstream.transport.close.assert_called_once()
+        assert client.closed.done()
+
 
 class TestFTPProxyEdgeCases:
     """Test edge cases and error handling."""
@@ -276,6 +554,68 @@ class TestFTPProxyEdgeCases:
         # Second stop should be safe
         await proxy.stop()
 
+    @pytest.mark.asyncio
+    async def test_stop_does_not_hang_on_stuck_connection(self, monkeypatch):
+        """Test that stop aborts a client that never reads its pending data."""
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_START", TEST_DATA_PORT_START)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_END", TEST_DATA_PORT_END)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.SHUTDOWN_TIMEOUT", 0.1)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.CLOSE_TIMEOUT", 60.0)
+
+        proxy = FTPProxy(printer_ip="127.0.0.1", bind_address="127.0.0.1")
+        proxy.port = TEST_CONTROL_PORT
+        mock_server, sock, client = await _open_stuck_connection(proxy)
+
+        try:
+            await asyncio.wait_for(proxy.stop(), timeout=2.0)
+            assert client.transport.is_closing()
+        finally:
+            sock.close()
+            mock_server.close()
+            await mock_server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_forced_stop_without_abort_clients(self, monkeypatch):
+        """Test forced shutdown with servers lacking abort_clients() (e.g. uvloop)."""
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_START", TEST_DATA_PORT_START)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.FTP_DATA_PORT_END", TEST_DATA_PORT_END)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.SHUTDOWN_TIMEOUT", 0.1)
+        monkeypatch.setattr("pandaproxy.ftp_proxy.CLOSE_TIMEOUT", 0.3)
+        monkeypatch.delattr(asyncio.Server, "abort_clients")
+        monkeypatch.delattr(asyncio.AbstractServer, "abort_clients")
+
+        proxy = FTPProxy(printer_ip="127.0.0.1", bind_address="127.0.0.1")
+        proxy.port = TEST_CONTROL_PORT
+        mock_server, sock, client = await _open_stuck_connection(proxy)
+
+        try:
+            await asyncio.wait_for(proxy.stop(), timeout=2.0)
+            assert client.closed.done()
+        finally:
+            sock.close()
+            mock_server.close()
+            await mock_server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_stop_leaves_foreign_tasks_alone(self, test_proxy):
+        """Test that stop only cancels tasks created by this proxy instance."""
+        other = FTPProxy(printer_ip="192.168.1.100", bind_address="127.0.0.1")
+        assert other._task_prefix != test_proxy._task_prefix
+
+        foreign = [
+            asyncio.create_task(asyncio.sleep(10), name="ftp-990"),
+            asyncio.create_task(asyncio.sleep(10), name=f"{other._task_prefix}990"),
+        ]
+        await asyncio.sleep(0)
+
+        try:
+            await test_proxy.stop()
+            assert not any(task.done() for task in foreign)
+        finally:
+            for task in foreign:
+                task.cancel()
+            await asyncio.gather(*foreign, return_exceptions=True)
+
     def test_proxy_configuration(self):
         """Test proxy configuration is stored correctly."""
         proxy = FTPProxy(
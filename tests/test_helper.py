@@ -167,6 +167,29 @@ class TestGenerateSelfSignedCert:
             # Should not raise
             ctx.load_cert_chain(cert_path, key_path)
 
+    def test_ec_cert_can_be_loaded_by_ssl_context(self):
+        """EC key cert should be loadable by SSL context."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cert_path = Path(tmpdir) / "test.crt"
+            key_path = Path(tmpdir) / "test.key"
+
+            generate_self_signed_cert(
+                common_name="TestCN",
+                output_cert=cert_path,
+                output_key=key_path,
+                key_type="ec",
+            )
+
+            assert "BEGIN EC PRIVATE KEY" in key_path.read_text()
+            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            # Should not raise
+            ctx.load_cert_chain(cert_path, key_path)
+
+    def test_rejects_unknown_key_type(self):
+        """Should raise ValueError for an unsupported key type."""
+        with pytest.raises(ValueError, match="Unsupported key type"):
+            generate_self_signed_cert(key_type="dsa")
+
 
 class TestCreateSslContext:
     """Tests for create_ssl_context function."""
@@ -3,12 +3,10 @@
 import asyncio
 import ssl
 import struct
-import tempfile
 from pathlib import Path
 
 import pytest
 
-from pandaproxy.helper import generate_self_signed_cert
 from pandaproxy.mqtt_protocol import (
     PacketType,
     build_publish,
@@ -17,24 +15,6 @@ from pandaproxy.mqtt_protocol import (
 from pandaproxy.mqtt_proxy import MQTTProxy
 
 
-@pytest.fixture
-def temp_certs():
-    """Generate temporary TLS certificates for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        cert_path = Path(tmpdir) / "test.crt"
-        key_path = Path(tmpdir) / "test.key"
-
-        generate_self_signed_cert(
-            common_name="TestProxy",
-            san_dns=["localhost"],
-            san_ips=["127.0.0.1", "::1"],
-            output_cert=cert_path,
-            output_key=key_path,
-        )
-
-        yield cert_path, key_path
-
-
 def _build_connect_packet(
     client_id: str = "test-client",
     username: str = "bblp",
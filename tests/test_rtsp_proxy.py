@@ -1,12 +1,10 @@
 """Tests for RTSP Proxy using FFmpeg and MediaMTX."""
 
-import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from pandaproxy.helper import generate_self_signed_cert
 from pandaproxy.rtsp_proxy import (
     MEDIAMTX_CONFIG_TEMPLATE,
     RTSPProxy,
@@ -14,24 +12,6 @@ from pandaproxy.rtsp_proxy import (
 )
 
 
-@pytest.fixture
-def temp_certs():
-    """Generate temporary TLS certificates for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        cert_path = Path(tmpdir) / "test.crt"
-        key_path = Path(tmpdir) / "test.key"
-
-        generate_self_signed_cert(
-            common_name="TestProxy",
-            san_dns=["localhost"],
-            san_ips=["127.0.0.1", "::1"],
-            output_cert=cert_path,
-            output_key=key_path,
-        )
-
-        yield cert_path, key_path
-
-
 class TestCheckDependencies:
     """Tests for check_dependencies function."""
 